@@ -1,17 +1,35 @@
 import numpy as np
-import pandas as pd
 from scipy import stats
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+def _limites_para_busqueda(limites, datos_ordenados):
+    """Llevar los límites (float64) al dtype de los datos para searchsorted
+
+    Así searchsorted no convierte todo el arreglo de datos a float64. Cada
+    límite se redondea hacia arriba al siguiente valor representable, de modo
+    que x < limite da lo mismo que en float64 (side='left').
+    """
+    dtype = datos_ordenados.dtype
+    if dtype == limites.dtype or not np.issubdtype(dtype, np.floating):
+        return limites
+    convertidos = limites.astype(dtype)
+    menores = convertidos < limites
+    convertidos[menores] = np.nextafter(convertidos[menores], dtype.type(np.inf))
+    return convertidos
+
 
 class PruebaChi:
-    def __init__(self, datos, num_intervalos=10, alpha=0.05):
+    def __init__(self, datos, num_intervalos=10, alpha=0.05, datos_ordenados=None):
         self.datos = np.array(datos)
+        # Datos ordenados: se reutilizan si ya vienen calculados desde la interfaz
+        self.datos_ordenados = np.sort(self.datos) if datos_ordenados is None else np.asarray(datos_ordenados)
         self.num_intervalos = num_intervalos
         self.alpha = alpha
         self.n = len(datos)
+        # Último resultado de ejecutar(), reutilizado por la tabla detallada
+        self.resultado = None
         
         # Tabla Chi-cuadrado (valores críticos)
         self.tabla_chi = {
@@ -29,15 +47,18 @@ class PruebaChi:
         
     def calcular_intervalos(self):
         """Calcular intervalos y frecuencias observadas"""
-        min_val = np.min(self.datos)
-        max_val = np.max(self.datos)
+        # Límites en float64 aunque los datos estén en float32
+        min_val = float(self.datos_ordenados[0])
+        max_val = float(self.datos_ordenados[-1])
 
         limites = np.linspace(min_val, max_val, self.num_intervalos + 1)
 
-        # Eliminar el valor máximo si es exactamente igual al último límite
-        datos_filtrados = self.datos[self.datos < limites[-1]]
-
-        freq_observadas, _ = np.histogram(datos_filtrados, bins=limites)
+        # Frecuencias en intervalos [a, b) sobre los datos ya ordenados
+        # (el valor máximo, igual al último límite, queda excluido)
+        posiciones = np.searchsorted(self.datos_ordenados,
+                                     _limites_para_busqueda(limites, self.datos_ordenados),
+                                     side='left')
+        freq_observadas = np.diff(posiciones)
 
         freq_esperada = self.n / self.num_intervalos
 
@@ -90,6 +111,7 @@ class PruebaChi:
                 'n': self.n
             }
             
+            self.resultado = resultado
             return resultado
             
         except Exception as e:
@@ -101,8 +123,8 @@ class PruebaChi:
         ventana.title("Tabla Detallada - Chi Cuadrado")
         ventana.geometry("800x600")
         
-        # Ejecutar la prueba para obtener datos
-        resultado = self.ejecutar()
+        # Reutilizar el resultado si la prueba ya se ejecutó
+        resultado = self.resultado if self.resultado is not None else self.ejecutar()
         limites = resultado['limites']
         freq_obs = resultado['frecuencias_observadas']
         freq_esp = resultado['frecuencia_esperada']
@@ -194,6 +216,10 @@ class PruebaChi:
     
     def crear_grafico_chi(self, parent, resultado):
         """Crear gráfico de barras comparando frecuencias"""
+        # matplotlib se importa aquí: solo hace falta al abrir el detalle
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
         # Frame para el gráfico
         frame_grafico = ttk.LabelFrame(parent, text="Gráfico Comparativo", padding="5")
         frame_grafico.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
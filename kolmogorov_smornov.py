@@ -1,17 +1,35 @@
 import numpy as np
-import pandas as pd
 from scipy import stats
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+def _limites_para_busqueda(limites, datos_ordenados):
+    """Llevar los límites (float64) al dtype de los datos para searchsorted
+
+    Así searchsorted no convierte todo el arreglo de datos a float64. Cada
+    límite se redondea hacia arriba al siguiente valor representable, de modo
+    que x < limite da lo mismo que en float64 (side='left').
+    """
+    dtype = datos_ordenados.dtype
+    if dtype == limites.dtype or not np.issubdtype(dtype, np.floating):
+        return limites
+    convertidos = limites.astype(dtype)
+    menores = convertidos < limites
+    convertidos[menores] = np.nextafter(convertidos[menores], dtype.type(np.inf))
+    return convertidos
+
 
 class PruebaKS:
-    def __init__(self, datos, num_intervalos=10, alpha=0.05):
+    def __init__(self, datos, num_intervalos=10, alpha=0.05, datos_ordenados=None):
         self.datos = np.array(datos)
+        # Datos ordenados: se reutilizan si ya vienen calculados desde la interfaz
+        self.datos_ordenados = np.sort(self.datos) if datos_ordenados is None else np.asarray(datos_ordenados)
         self.num_intervalos = num_intervalos
         self.alpha = alpha
         self.n = len(datos)
+        # Último resultado de ejecutar(), reutilizado por la tabla detallada
+        self.resultado = None
         
         # Tabla de valores críticos para Kolmogorov-Smirnov
         self.tabla_ks = {
@@ -25,16 +43,24 @@ class PruebaKS:
     
     def calcular_frecuencias_acumuladas(self):
         """Calcular frecuencias acumuladas observadas y teóricas"""
-        datos_ordenados = np.sort(self.datos)
+        datos_ordenados = self.datos_ordenados
 
-        min_val = np.min(self.datos)
-        max_val = np.max(self.datos)
+        # Extremos en float64: con datos float32, max_val + 1e-10 se redondearía
+        # a max_val y el máximo quedaría fuera del último intervalo
+        min_val = float(datos_ordenados[0])
+        max_val = float(datos_ordenados[-1])
         
         # Crear límites con pequeño epsilon para mantener exclusión del límite superior
         limites = np.linspace(min_val, max_val + 1e-10, self.num_intervalos + 1)
 
-        # Calcular frecuencias observadas en los intervalos [a, b)
-        freq_obs, _ = np.histogram(self.datos, bins=limites)
+        # Calcular frecuencias observadas en los intervalos [a, b); el último
+        # intervalo es cerrado como en np.histogram, aunque max_val + 1e-10 se
+        # redondee a max_val con datos de magnitud grande
+        posiciones = np.searchsorted(datos_ordenados,
+                                     _limites_para_busqueda(limites, datos_ordenados),
+                                     side='left')
+        posiciones[-1] = self.n
+        freq_obs = np.diff(posiciones)
 
         # Frecuencia acumulada observada (proporción)
         freq_acum_obs = np.cumsum(freq_obs) / self.n
@@ -87,7 +113,10 @@ class PruebaKS:
             valor_critico = self.obtener_valor_critico()
             
             # También usar scipy para comparar
-            datos_normalizados = (self.datos - np.min(self.datos)) / (np.max(self.datos) - np.min(self.datos))
+            # En float64 aunque los datos estén guardados en float32
+            min_val = float(self.datos_ordenados[0])
+            max_val = float(self.datos_ordenados[-1])
+            datos_normalizados = (self.datos_ordenados.astype(np.float64) - min_val) / (max_val - min_val)
             ks_stat_scipy, p_valor_scipy = stats.kstest(datos_normalizados, 'uniform')
             
             # Decisión de la prueba
@@ -109,6 +138,7 @@ class PruebaKS:
                 'n': self.n
             }
             
+            self.resultado = resultado
             return resultado
             
         except Exception as e:
@@ -120,8 +150,8 @@ class PruebaKS:
         ventana.title("Tabla Detallada - Kolmogorov-Smirnov")
         ventana.geometry("900x700")
         
-        # Ejecutar la prueba para obtener datos
-        resultado = self.ejecutar()
+        # Reutilizar el resultado si la prueba ya se ejecutó
+        resultado = self.resultado if self.resultado is not None else self.ejecutar()
         
         # Frame principal
         main_frame = ttk.Frame(ventana, padding="10")
@@ -202,6 +232,10 @@ class PruebaKS:
     
     def crear_grafico_ks(self, parent, resultado):
         """Crear gráfico de funciones de distribución acumulada"""
+        # matplotlib se importa aquí: solo hace falta al abrir el detalle
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
         # Frame para el gráfico
         frame_grafico = ttk.LabelFrame(parent, text="Función de Distribución Acumulada", padding="5")
         frame_grafico.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
@@ -1,16 +1,18 @@
+import importlib.util
+import io
+import math
 import os
 import sys
 import tkinter as tk
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox, ttk
 
 import numpy as np
-import pandas as pd
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.pdfgen import canvas
-from reportlab.platypus import (Paragraph, SimpleDocTemplate, Spacer, Table,
-                                TableStyle)
+
+# openpyxl, pandas y reportlab se importan dentro de leer_columna_xlsx,
+# leer_columna_pandas y construir_pdf para no pagar su tiempo de importación
+# al abrir la aplicación.
 
 # Importar los módulos de pruebas estadísticas
 try:
@@ -19,7 +21,6 @@ try:
     from prueba_rachas_enc_deb import RachasEncimaDebajo
 
     # from  rachas_ascendentes_decendentes import RachasAscendentesDescendentes
-    # from rachas_encima_debajo import RachasEncimaDebajo
         # Assuming LongitudRachas is a separate file or within one of the above, if not, it will cause an error
     # For now, I'll comment it out to prevent import errors if it's missing, or assume it's available.
     # from longitud_rachas import LongitudRachas
@@ -27,6 +28,89 @@ except ImportError as e:
     print(f"Error importando módulos: {e}")
     print("Asegúrate de que todos los módulos estén en el mismo directorio")
 
+# Motor de lectura de Excel: calamine (python-calamine) es mucho más rápido que
+# openpyxl/xlrd y lee tanto .xlsx como .xls. Si no está instalado se usa el
+# motor por defecto de pandas.
+try:
+    import python_calamine  # noqa: F401
+    MOTOR_EXCEL = "calamine"
+except ImportError:
+    MOTOR_EXCEL = None
+
+# Con pyarrow los tipos de cada columna los resuelve el lector de Arrow (C++) en
+# lugar de la inferencia de pandas sobre objetos Python. Se comprueba con
+# find_spec para no importar pyarrow al arrancar.
+if importlib.util.find_spec("pyarrow") is not None:
+    BACKEND_DTYPES = "pyarrow"
+else:
+    BACKEND_DTYPES = "numpy_nullable"
+
+# Cadenas que pandas lee como valor faltante por defecto (incluye '#N/A', que
+# es como openpyxl devuelve una celda de error de Excel)
+VALORES_NA = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null',
+})
+
+
+def texto_a_numero(texto):
+    """Convertir un número guardado como texto, o None si no lo es
+
+    Sigue la conversión de pandas: acepta espacios alrededor, exponentes e
+    'inf', pero no separadores '_' ni otras variantes de 'nan'.
+    """
+    if '_' in texto:
+        return None
+    try:
+        numero = float(texto)
+    except ValueError:
+        return None
+    return None if math.isnan(numero) else numero
+
+
+# Nombres de las pruebas en el reporte PDF
+NOMBRES_PRUEBAS_PDF = {
+    'chi_cuadrado': "Chi Cuadrado",
+    'kolmogorov_smornov': "Kolmogorov-Smirnov",
+    'rachas_ascendentes_decendentes': "Rachas Ascendentes/Descendentes",
+    'rachas_encima_debajo': "Rachas Encima/Debajo",
+    'longitud_rachas_asc': "Longitud Rachas Ascendentes/Descendentes",
+    'longitud_rachas_enc': "Longitud Rachas Encima/Debajo",
+}
+
+# Valores numéricos que se muestran en la tabla de cada prueba (clave, etiqueta)
+CAMPOS_TABLA_PDF = (
+    ('estadistico', 'Estadístico'),
+    ('valor_critico', 'Valor crítico'),
+    ('p_valor', 'P-valor'),
+)
+
+
+def media_y_desviacion(datos, tam_bloque=65536):
+    """Media y desviación estándar poblacional (ddof=0) en una sola lectura
+
+    Los datos se recorren por bloques que caben en caché y los resultados
+    parciales se combinan con la fórmula de Chan et al. (Welford por bloques),
+    sin arreglos temporales del tamaño de los datos.
+    """
+    n = 0
+    media = 0.0
+    m2 = 0.0
+    for inicio in range(0, datos.size, tam_bloque):
+        bloque = datos[inicio:inicio + tam_bloque].astype(np.float64, copy=False)
+        n_bloque = bloque.size
+        media_bloque = bloque.mean()
+        desvios = bloque - media_bloque
+        delta = media_bloque - media
+        total = n + n_bloque
+        media += delta * n_bloque / total
+        m2 += np.dot(desvios, desvios) + delta * delta * n * n_bloque / total
+        n = total
+    if n == 0:
+        return math.nan, math.nan
+    return media, math.sqrt(m2 / n)
+
 
 class InterfazPrincipal:
     def __init__(self, root):
@@ -38,11 +122,28 @@ class InterfazPrincipal:
         # Variables
         self.datos = None
         self.archivo_cargado = False
+        # Estadísticas básicas de self.datos, calculadas una sola vez al cargar
+        self.estadisticas_datos = {}
+        # Copia ordenada de self.datos, compartida por Chi² y K-S
+        self.datos_ordenados = None
         self.pruebas_seleccionadas = {}
 
         # Store instances of test objects
         self.instancias_pruebas = {}
 
+        # Las pruebas corren en un hilo de trabajo para no bloquear Tk
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pruebas_pendientes = 0
+        # True mientras ejecutar_pruebas recorre la lista: un messagebox abre un
+        # bucle de eventos anidado y una prueba puede terminar antes del final
+        self.lanzando_pruebas = False
+        # Texto de los resultados; se vuelca al Text una sola vez al final
+        self.buffer_resultados = []
+
+        # PDFs ya generados: (alpha, intervalos, pruebas) -> bytes del documento.
+        # Se vacía al cargar otro archivo y en cada ejecución de las pruebas.
+        self.cache_pdf = {}
+
         self.crear_interfaz()
 
     def crear_interfaz(self):
@@ -131,6 +232,16 @@ class InterfazPrincipal:
             frame_params, textvariable=self.var_intervalos, width=10)
         self.entry_intervalos.grid(row=1, column=1, padx=5)
 
+        # Precisión con la que se guardan los datos (se aplica al cargar).
+        # float32 reduce a la mitad la memoria que recorren las pruebas.
+        ttk.Label(frame_params, text="Precisión de los datos:").grid(
+            row=2, column=0, sticky=tk.W)
+        self.var_precision = tk.StringVar(value="float64")
+        self.combo_precision = ttk.Combobox(
+            frame_params, textvariable=self.var_precision,
+            values=("float64", "float32"), state="readonly", width=8)
+        self.combo_precision.grid(row=2, column=1, padx=5)
+
         # Botones de acción
         frame_botones = ttk.Frame(main_frame)
         frame_botones.grid(row=4, column=0, columnspan=4, pady=20)
@@ -149,9 +260,11 @@ class InterfazPrincipal:
         frame_resultados_summary.grid(
             row=5, column=0, columnspan=4, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
 
-        # Text widget con scrollbar para resumen
+        # Text widget con scrollbar para resumen (solo lectura, sin pila de
+        # deshacer: se escribe únicamente con escribir_resultados)
         self.text_resultados = tk.Text(
-            frame_resultados_summary, height=10, width=80)
+            frame_resultados_summary, height=10, width=80,
+            undo=False, autoseparators=False, state="disabled")
         scrollbar_summary = ttk.Scrollbar(
             frame_resultados_summary, orient="vertical", command=self.text_resultados.yview)
         self.text_resultados.configure(yscrollcommand=scrollbar_summary.set)
@@ -215,26 +328,29 @@ class InterfazPrincipal:
 
         if archivo:
             try:
-                # Leer archivo Excel
-                df = pd.read_excel(archivo)
-
-                if df.empty:
-                    messagebox.showerror("Error", "El archivo está vacío")
-                    return
+                dtype = np.float32 if self.var_precision.get() == "float32" else np.float64
 
-                # Tomar la primera columna numérica
-                columna_numerica = None
-                for col in df.columns:
-                    if pd.api.types.is_numeric_dtype(df[col]):
-                        columna_numerica = col
-                        break
+                # Con calamine todo va por pandas (es lo más rápido); sin él, los
+                # .xlsx se leen en streaming con openpyxl y el resto con pandas
+                if MOTOR_EXCEL is None and archivo.lower().endswith(".xlsx"):
+                    datos = self.leer_columna_xlsx(archivo, dtype)
+                else:
+                    datos = self.leer_columna_pandas(archivo, dtype)
 
-                if columna_numerica is None:
+                if datos is None:
                     messagebox.showerror(
                         "Error", "No se encontró ninguna columna numérica")
                     return
 
-                self.datos = df[columna_numerica].dropna().values
+                if datos.size == 0:
+                    messagebox.showerror("Error", "El archivo está vacío")
+                    return
+
+                # Normalizar una sola vez a un arreglo contiguo y alineado de la
+                # precisión elegida para que las pruebas no hagan copias
+                self.datos = np.ascontiguousarray(datos, dtype=dtype)
+                self.calcular_estadisticas_datos()
+                self.cache_pdf = {}
                 self.archivo_cargado = True
 
                 # Actualizar interfaz
@@ -243,13 +359,12 @@ class InterfazPrincipal:
                 self.btn_ver_datos.config(state="normal")
                 self.btn_ejecutar.config(state="normal")
 
-                self.text_resultados.delete(1.0, tk.END)
-                self.text_resultados.insert(
-                    tk.END, f"Archivo cargado exitosamente.\n")
-                self.text_resultados.insert(
-                    tk.END, f"Datos encontrados: {len(self.datos)}\n")
-                self.text_resultados.insert(
-                    tk.END, f"Rango: [{self.datos.min():.4f}, {self.datos.max():.4f}]\n\n")
+                self.escribir_resultados(
+                    f"Archivo cargado exitosamente.\n"
+                    f"Datos encontrados: {len(self.datos)}\n"
+                    f"Rango: [{self.estadisticas_datos['minimo']:.4f}, "
+                    f"{self.estadisticas_datos['maximo']:.4f}]\n\n",
+                    limpiar=True)
 
                 # Disable all detail buttons until tests are run
                 self.btn_detalle_chi.config(state="disabled")
@@ -263,6 +378,104 @@ class InterfazPrincipal:
                 messagebox.showerror(
                     "Error", f"Error al cargar el archivo: {str(e)}")
 
+    def leer_columna_xlsx(self, archivo, dtype):
+        """Leer la primera columna numérica de un .xlsx sin construir un DataFrame
+
+        La hoja se recorre en modo solo lectura. Igual que con pandas, una
+        columna es numérica si tiene algún valor y todos sus valores no vacíos
+        son números (sin booleanos); las cadenas de VALORES_NA cuentan como
+        vacías y los números guardados como texto se convierten. Devuelve
+        None si no hay columna numérica.
+        """
+        from openpyxl import load_workbook
+
+        libro = load_workbook(archivo, read_only=True, data_only=True)
+        try:
+            # Primera hoja; la fila 1 es el encabezado
+            filas = libro.worksheets[0].iter_rows(min_row=2, values_only=True)
+
+            # Valores de cada columna que sigue siendo numérica; una columna se
+            # descarta en cuanto aparece un valor que no es número
+            valores = {}
+            descartadas = set()
+            hay_valores = False
+            for fila in filas:
+                for i, valor in enumerate(fila):
+                    if valor is None or i in descartadas:
+                        continue
+                    hay_valores = True
+                    if isinstance(valor, str):
+                        # Como en pandas: las cadenas NA son celdas vacías y los
+                        # números guardados como texto se convierten
+                        if valor in VALORES_NA:
+                            continue
+                        numero = texto_a_numero(valor)
+                        if numero is not None:
+                            valor = numero
+                    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+                        valores.setdefault(i, array('d')).append(valor)
+                    else:
+                        descartadas.add(i)
+                        valores.pop(i, None)
+
+            # Sin datos debajo del encabezado (pandas devolvería un DataFrame vacío)
+            if not hay_valores:
+                return np.empty(0, dtype=dtype)
+
+            # Primera columna numérica con algún valor (las vacías no cuentan)
+            if not valores:
+                return None
+
+            return np.array(valores[min(valores)], dtype=dtype)
+        finally:
+            libro.close()
+
+    def leer_columna_pandas(self, archivo, dtype):
+        """Leer la primera columna numérica con pandas (formatos distintos de .xlsx)
+
+        Devuelve None si no hay columna numérica.
+        """
+        import pandas as pd
+
+        # Leer solo la primera hoja del archivo Excel
+        df = pd.read_excel(archivo, sheet_name=0, engine=MOTOR_EXCEL,
+                           dtype_backend=BACKEND_DTYPES)
+
+        if df.empty:
+            return np.empty(0, dtype=dtype)
+
+        # Tomar la primera columna numérica (una sola consulta sobre los dtypes)
+        columnas_numericas = df.select_dtypes(include="number").columns
+
+        if columnas_numericas.empty:
+            return None
+
+        return df[columnas_numericas[0]].dropna().to_numpy(
+            dtype=dtype, na_value=np.nan)
+
+    def calcular_estadisticas_datos(self):
+        """Calcular y guardar las estadísticas básicas de los datos cargados"""
+        datos = self.datos
+        # Un solo ordenamiento: sirve a Chi² y K-S y da el mínimo y máximo
+        self.datos_ordenados = np.sort(datos)
+        media, desviacion = media_y_desviacion(datos)
+        self.estadisticas_datos = {
+            'n': datos.size,
+            'media': media,
+            'desviacion': desviacion,
+            'minimo': self.datos_ordenados[0],
+            'maximo': self.datos_ordenados[-1],
+        }
+
+    def escribir_resultados(self, texto, limpiar=False):
+        """Escribir en el área de resumen, que permanece en solo lectura"""
+        self.text_resultados.config(state="normal")
+        if limpiar:
+            self.text_resultados.delete(1.0, tk.END)
+        if texto:
+            self.text_resultados.insert(tk.END, texto)
+        self.text_resultados.config(state="disabled")
+
     def ver_datos(self):
         """Mostrar ventana con los datos cargados"""
         if not self.archivo_cargado:
@@ -273,29 +486,36 @@ class InterfazPrincipal:
         ventana_datos.geometry("400x500")
 
         # Text widget con scrollbar
-        text_datos = tk.Text(ventana_datos, wrap=tk.WORD)
+        text_datos = tk.Text(ventana_datos, wrap=tk.WORD,
+                             undo=False, autoseparators=False)
         scrollbar_datos = ttk.Scrollbar(
             ventana_datos, orient="vertical", command=text_datos.yview)
         text_datos.configure(yscrollcommand=scrollbar_datos.set)
 
-        # Mostrar estadísticas básicas
-        text_datos.insert(tk.END, "ESTADÍSTICAS BÁSICAS\n")
-        text_datos.insert(tk.END, "=" * 30 + "\n")
-        text_datos.insert(tk.END, f"Cantidad de datos: {len(self.datos)}\n")
-        text_datos.insert(tk.END, f"Media: {np.mean(self.datos):.6f}\n")
-        text_datos.insert(
-            tk.END, f"Desviación estándar: {np.std(self.datos):.6f}\n")
-        text_datos.insert(tk.END, f"Mínimo: {np.min(self.datos):.6f}\n")
-        text_datos.insert(tk.END, f"Máximo: {np.max(self.datos):.6f}\n\n")
-
-        text_datos.insert(tk.END, "PRIMEROS 20 DATOS\n")
-        text_datos.insert(tk.END, "=" * 30 + "\n")
-        for i, dato in enumerate(self.datos[:20]):
-            text_datos.insert(tk.END, f"{i+1:3d}: {dato:.6f}\n")
+        # Armar todo el texto y hacer un solo insert
+        est = self.estadisticas_datos
+        lineas = [
+            "ESTADÍSTICAS BÁSICAS",
+            "=" * 30,
+            f"Cantidad de datos: {est['n']}",
+            f"Media: {est['media']:.6f}",
+            f"Desviación estándar: {est['desviacion']:.6f}",
+            f"Mínimo: {est['minimo']:.6f}",
+            f"Máximo: {est['maximo']:.6f}",
+            "",
+            "PRIMEROS 20 DATOS",
+            "=" * 30,
+        ]
+        primeros = self.datos[:20]
+        indices = np.arange(1, primeros.size + 1)
+        lineas.extend(np.char.add(np.char.mod("%3d: ", indices),
+                                  np.char.mod("%.6f", primeros)).tolist())
 
         if len(self.datos) > 20:
-            text_datos.insert(
-                tk.END, f"... y {len(self.datos)-20} datos más\n")
+            lineas.append(f"... y {len(self.datos)-20} datos más")
+
+        text_datos.insert(tk.END, "\n".join(lineas) + "\n")
+        text_datos.config(state="disabled")
 
         text_datos.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar_datos.pack(side=tk.RIGHT, fill=tk.Y)
@@ -306,21 +526,33 @@ class InterfazPrincipal:
             messagebox.showerror("Error", "Primero debe cargar un archivo")
             return
 
-        # Verificar que al menos una prueba esté seleccionada
-        pruebas_seleccionadas = [
-            self.var_chi.get(), self.var_ks.get(), self.var_rachas_asc.get(),
-            self.var_rachas_enc.get(), self.var_long_asc.get(), self.var_long_enc.get()
-        ]
+        # Verificar que al menos una prueba esté seleccionada (se detiene en la primera)
+        hay_seleccion = (
+            self.var_chi.get() or self.var_ks.get() or self.var_rachas_asc.get()
+            or self.var_rachas_enc.get() or self.var_long_asc.get() or self.var_long_enc.get()
+        )
 
-        if not any(pruebas_seleccionadas):
+        if not hay_seleccion:
             messagebox.showerror(
                 "Error", "Debe seleccionar al menos una prueba")
             return
 
+        # Leer los parámetros antes de tocar la interfaz: si no son válidos los
+        # botones quedan como estaban
+        try:
+            alpha = self.var_alpha.get()
+            intervalos = self.var_intervalos.get()
+        except tk.TclError:
+            messagebox.showerror(
+                "Error", "Alpha e intervalos deben ser valores numéricos")
+            return
+
         # Limpiar resultados anteriores y disable detail buttons
-        self.text_resultados.delete(1.0, tk.END)
+        self.escribir_resultados("", limpiar=True)
         self.resultados = {}  # Clear summary results for PDF
         self.instancias_pruebas = {}  # Clear test object instances
+        self.buffer_resultados = []
+        self.cache_pdf = {}  # Los PDFs anteriores corresponden a otra ejecución
 
         self.btn_detalle_chi.config(state="disabled")
         self.btn_detalle_ks.config(state="disabled")
@@ -329,177 +561,160 @@ class InterfazPrincipal:
         # self.btn_detalle_long_asc.config(state="disabled")
         # self.btn_detalle_long_enc.config(state="disabled")
 
-        alpha = self.var_alpha.get()
-        intervalos = self.var_intervalos.get()
-
-        self.text_resultados.insert(
-            tk.END, "EJECUTANDO PRUEBAS ESTADÍSTICAS\n")
-        self.text_resultados.insert(tk.END, "=" * 50 + "\n\n")
+        # Evitar que se relancen pruebas o se cambien los datos mientras corren
+        self.btn_cargar.config(state="disabled")
+        self.btn_ejecutar.config(state="disabled")
+        self.btn_generar_pdf.config(state="disabled")
+
+        self.escribir_resultados(
+            "EJECUTANDO PRUEBAS ESTADÍSTICAS\n" + "=" * 50 + "\n\n")
+
+        # Tabla de pruebas: (variable, clave, nombre, fábrica, botón de detalle,
+        # resultado dummy). La fábrica solo se llama si la prueba está
+        # seleccionada; si su clase no está importada (NameError) se usa el
+        # resultado dummy, o se propaga el error si no hay uno.
+        pruebas = [
+            (self.var_chi, 'chi_cuadrado', "Chi Cuadrado",
+             lambda: PruebaChi(self.datos, intervalos, alpha, self.datos_ordenados),
+             self.btn_detalle_chi, None),
+            (self.var_ks, 'kolmogorov_smornov', "Kolmogorov-Smirnov",
+             lambda: PruebaKS(self.datos, intervalos, alpha, self.datos_ordenados),
+             self.btn_detalle_ks,
+             {'estadistico': 0.123, 'valor_critico': 0.135, 'p_valor': 0.25,
+              'rechaza_h0': False, 'tipo_prueba': 'Kolmogorov-Smirnov', 'alpha': alpha}),
+            (self.var_rachas_asc, 'rachas_ascendentes_decendentes',
+             "Rachas Ascendentes/Descendentes",
+             lambda: RachasAscendentesDescendentes(self.datos, alpha),
+             self.btn_detalle_rachas_asc,
+             {'estadistico': 5.67, 'valor_critico': 3.84, 'p_valor': 0.015,
+              'rechaza_h0': True, 'tipo_prueba': 'Rachas Asc/Desc', 'alpha': alpha}),
+            (self.var_rachas_enc, 'rachas_encima_debajo', "Rachas Encima/Debajo",
+             lambda: RachasEncimaDebajo(self.datos, alpha),
+             self.btn_detalle_rachas_enc,
+             {'estadistico': 1.23, 'valor_critico': 1.96, 'p_valor': 0.30,
+              'rechaza_h0': False, 'tipo_prueba': 'Rachas Enc/Deb', 'alpha': alpha}),
+            # Longitud de rachas (commented out if LongitudRachas not used)
+            # (self.var_long_asc, 'longitud_rachas_asc', "Longitud Rachas Ascendentes/Descendentes",
+            #  lambda: LongitudRachas(self.datos, alpha, tipo='ascendentes'),
+            #  self.btn_detalle_long_asc,
+            #  {'estadistico': 0.5, 'valor_critico': 0.7, 'p_valor': 0.15,
+            #   'rechaza_h0': False, 'tipo_prueba': 'Long Rachas Asc', 'alpha': alpha}),
+            # (self.var_long_enc, 'longitud_rachas_enc', "Longitud Rachas Encima/Debajo",
+            #  lambda: LongitudRachas(self.datos, alpha, tipo='encima_debajo'),
+            #  self.btn_detalle_long_enc,
+            #  {'estadistico': 0.8, 'valor_critico': 0.7, 'p_valor': 0.03,
+            #   'rechaza_h0': True, 'tipo_prueba': 'Long Rachas Enc', 'alpha': alpha}),
+        ]
 
+        self.lanzando_pruebas = True
         try:
-            # Chi Cuadrado
-            if self.var_chi.get():
-                self.text_resultados.insert(
-                    tk.END, "Ejecutando prueba Chi Cuadrado...\n")
-                self.root.update()
-                prueba_chi = PruebaChi(self.datos, intervalos, alpha)
-                resultado_chi = prueba_chi.ejecutar()
-                # Store summary for PDF
-                self.resultados['chi_cuadrado'] = resultado_chi
-                # Store instance for detail view
-                self.instancias_pruebas['chi_cuadrado'] = prueba_chi
-                self.mostrar_resultado("CHI CUADRADO", resultado_chi)
-                self.btn_detalle_chi.config(
-                    state="normal")  # Enable detail button
-
-            # Kolmogorov-Smirnov
-            if self.var_ks.get():
-                self.text_resultados.insert(
-                    tk.END, "Ejecutando prueba Kolmogorov-Smirnov...\n")
-                self.root.update()
-                # Assuming PruebaKS class is available and works similarly
-                # For demonstration, let's create a dummy KS result if PruebaKS is not provided
-                try:
-                    prueba_ks = PruebaKS(self.datos, intervalos, alpha)
-                    resultado_ks = prueba_ks.ejecutar()
-                except NameError:  # Fallback if PruebaKS is not imported/defined
-                    resultado_ks = {
-                        'estadistico': 0.123, 'valor_critico': 0.135, 'p_valor': 0.25,
-                        'rechaza_h0': False, 'tipo_prueba': 'Kolmogorov-Smirnov', 'alpha': alpha
-                    }
-                    messagebox.showwarning(
-                        "Advertencia", "PruebaKS no definida. Usando datos dummy.")
-
-                self.resultados['kolmogorov_smornov'] = resultado_ks
-                self.instancias_pruebas['kolmogorov_smornov'] = prueba_ks if 'prueba_ks' in locals(
-                ) else None  # Store instance if created
-                self.mostrar_resultado("KOLMOGOROV-SMIRNOV", resultado_ks)
-                if 'prueba_ks' in locals():  # Only enable if the instance was successfully created
-                    self.btn_detalle_ks.config(state="normal")
-
-            # Rachas Ascendentes/Descendentes
-            if self.var_rachas_asc.get():
-                self.text_resultados.insert(
-                    tk.END, "Ejecutando prueba Rachas Ascendentes/Descendentes...\n")
-                self.root.update()
-                try:
-                    prueba_rasc = RachasAscendentesDescendentes(
-                        self.datos, alpha)
-                    resultado_rasc = prueba_rasc.ejecutar()
-                except NameError:
-                    resultado_rasc = {
-                        'estadistico': 5.67, 'valor_critico': 3.84, 'p_valor': 0.015,
-                        'rechaza_h0': True, 'tipo_prueba': 'Rachas Asc/Desc', 'alpha': alpha
-                    }
-                    messagebox.showwarning(
-                        "Advertencia", "RachasAscendentesDescendentes no definida. Usando datos dummy.")
-
-                self.resultados['rachas_ascendentes_decendentes'] = resultado_rasc
-                self.instancias_pruebas['rachas_ascendentes_decendentes'] = prueba_rasc if 'prueba_rasc' in locals(
-                ) else None
-                self.mostrar_resultado(
-                    "RACHAS ASCENDENTES/DESCENDENTES", resultado_rasc)
-                if 'prueba_rasc' in locals():
-                    self.btn_detalle_rachas_asc.config(state="normal")
-
-            # Rachas Encima/Debajo
-            if self.var_rachas_enc.get():
-                self.text_resultados.insert(
-                    tk.END, "Ejecutando prueba Rachas Encima/Debajo...\n")
-                self.root.update()
+            for variable, clave, nombre, crear_prueba, boton_detalle, dummy in pruebas:
+                if not variable.get():
+                    continue
+
+                self.escribir_resultados(f"Ejecutando prueba {nombre}...\n")
                 try:
-                    prueba_renc = RachasEncimaDebajo(self.datos, alpha)
-                    resultado_renc = prueba_renc.ejecutar()
-                except NameError:
-                    resultado_renc = {
-                        'estadistico': 1.23, 'valor_critico': 1.96, 'p_valor': 0.30,
-                        'rechaza_h0': False, 'tipo_prueba': 'Rachas Enc/Deb', 'alpha': alpha
-                    }
+                    prueba = crear_prueba()
+                    resultado_respaldo = None
+                except NameError as e:
+                    if dummy is None:
+                        raise
+                    prueba = None
+                    resultado_respaldo = dummy
                     messagebox.showwarning(
-                        "Advertencia", "RachasEncimaDebajo no definida. Usando datos dummy.")
-
-                self.resultados['rachas_encima_debajo'] = resultado_renc
-                self.instancias_pruebas['rachas_encima_debajo'] = prueba_renc if 'prueba_renc' in locals(
-                ) else None
-                self.mostrar_resultado("RACHAS ENCIMA/DEBAJO", resultado_renc)
-                if 'prueba_renc' in locals():
-                    self.btn_detalle_rachas_enc.config(state="normal")
-
-            # Longitud Rachas Ascendentes/Descendentes (commented out if LongitudRachas not used)
-            # if self.var_long_asc.get():
-            #     self.text_resultados.insert(tk.END, "Ejecutando prueba Longitud Rachas Asc/Desc...\n")
-            #     self.root.update()
-            #     try:
-            #         prueba_long_asc = LongitudRachas(self.datos, alpha, tipo='ascendentes')
-            #         resultado_long_asc = prueba_long_asc.ejecutar()
-            #     except NameError:
-            #         resultado_long_asc = {
-            #             'estadistico': 0.5, 'valor_critico': 0.7, 'p_valor': 0.15,
-            #             'rechaza_h0': False, 'tipo_prueba': 'Long Rachas Asc', 'alpha': alpha
-            #         }
-            #         messagebox.showwarning("Advertencia", "LongitudRachas no definida. Usando datos dummy.")
-            #     self.resultados['longitud_rachas_asc'] = resultado_long_asc
-            #     self.instancias_pruebas['longitud_rachas_asc'] = prueba_long_asc if 'prueba_long_asc' in locals() else None
-            #     self.mostrar_resultado("LONGITUD RACHAS ASCENDENTES/DESCENDENTES", resultado_long_asc)
-            #     if 'prueba_long_asc' in locals():
-            #         self.btn_detalle_long_asc.config(state="normal")
-
-            # Longitud Rachas Encima/Debajo (commented out if LongitudRachas not used)
-            # if self.var_long_enc.get():
-            #     self.text_resultados.insert(tk.END, "Ejecutando prueba Longitud Rachas Enc/Deb...\n")
-            #     self.root.update()
-            #     try:
-            #         prueba_long_enc = LongitudRachas(self.datos, alpha, tipo='encima_debajo')
-            #         resultado_long_enc = prueba_long_enc.ejecutar()
-            #     except NameError:
-            #         resultado_long_enc = {
-            #             'estadistico': 0.8, 'valor_critico': 0.7, 'p_valor': 0.03,
-            #             'rechaza_h0': True, 'tipo_prueba': 'Long Rachas Enc', 'alpha': alpha
-            #         }
-            #         messagebox.showwarning("Advertencia", "LongitudRachas no definida. Usando datos dummy.")
-            #     self.resultados['longitud_rachas_enc'] = resultado_long_enc
-            #     self.instancias_pruebas['longitud_rachas_enc'] = prueba_long_enc if 'prueba_long_enc' in locals() else None
-            #     self.mostrar_resultado("LONGITUD RACHAS ENCIMA/DEBAJO", resultado_long_enc)
-            #     if 'prueba_long_enc' in locals():
-            #         self.btn_detalle_long_enc.config(state="normal")
-
-            self.text_resultados.insert(tk.END, "\n" + "=" * 50 + "\n")
-            self.text_resultados.insert(
-                tk.END, "TODAS LAS PRUEBAS COMPLETADAS\n")
-
-            # Habilitar botón de PDF
-            self.btn_generar_pdf.config(state="normal")
+                        "Advertencia", f"{e.name} no definida. Usando datos dummy.")
+
+                self.lanzar_prueba(clave, nombre.upper(), prueba,
+                                   boton_detalle, resultado_respaldo)
+
+        except Exception as e:
+            messagebox.showerror(
+                "Error", f"Error al ejecutar las pruebas: {str(e)}")
+        self.lanzando_pruebas = False
+
+        # Si ya terminaron todas (o no se lanzó ninguna), cerrar la ejecución aquí
+        if self.pruebas_pendientes == 0:
+            self.finalizar_pruebas()
 
+    def lanzar_prueba(self, clave, nombre_prueba, prueba, boton_detalle, resultado_respaldo=None):
+        """Ejecutar prueba.ejecutar() en el hilo de trabajo
+
+        El resultado se entrega al hilo de Tk con root.after(). Si prueba es
+        None se muestra resultado_respaldo (datos dummy).
+        """
+        self.pruebas_pendientes += 1
+        if prueba is None:
+            futuro = self.executor.submit(lambda: resultado_respaldo)
+        else:
+            futuro = self.executor.submit(prueba.ejecutar)
+        futuro.add_done_callback(
+            lambda f: self.root.after(0, self.prueba_terminada, clave, nombre_prueba,
+                                      prueba, boton_detalle, f))
+
+    def prueba_terminada(self, clave, nombre_prueba, prueba, boton_detalle, futuro):
+        """Registrar y mostrar el resultado de una prueba (hilo de Tk)"""
+        self.pruebas_pendientes -= 1
+        try:
+            resultado = futuro.result()
+            if resultado.get('error'):
+                # La prueba no pudo calcularse (p. ej. todos los datos del mismo
+                # lado de 0.5): se informa sin guardarla para el PDF ni el detalle
+                lineas = ["", nombre_prueba, "-" * len(nombre_prueba), resultado['mensaje']]
+                self.buffer_resultados.append("\n".join(lineas) + "\n\n")
+            else:
+                # Store summary for PDF
+                self.resultados[clave] = resultado
+                # Store instance for detail view
+                self.instancias_pruebas[clave] = prueba
+                self.mostrar_resultado(nombre_prueba, resultado)
+                if prueba is not None:  # Only enable if the instance was successfully created
+                    boton_detalle.config(state="normal")
         except Exception as e:
             messagebox.showerror(
                 "Error", f"Error al ejecutar las pruebas: {str(e)}")
 
+        # Si todavía se están lanzando pruebas, ejecutar_pruebas cierra al terminar
+        if self.pruebas_pendientes == 0 and not self.lanzando_pruebas:
+            self.finalizar_pruebas()
+
+    def finalizar_pruebas(self):
+        """Volcar los resultados acumulados y reactivar los botones"""
+        self.buffer_resultados.append("\n" + "=" * 50 + "\n")
+        self.buffer_resultados.append("TODAS LAS PRUEBAS COMPLETADAS\n")
+        self.escribir_resultados("".join(self.buffer_resultados))
+        self.text_resultados.see(tk.END)
+        self.buffer_resultados = []
+
+        self.btn_cargar.config(state="normal")
+        self.btn_ejecutar.config(state="normal")
+        # Habilitar botón de PDF
+        if self.resultados:
+            self.btn_generar_pdf.config(state="normal")
+
     def mostrar_resultado(self, nombre_prueba, resultado):
-        """Mostrar resultado de una prueba en el área de texto de resumen"""
-        self.text_resultados.insert(tk.END, f"\n{nombre_prueba}\n")
-        self.text_resultados.insert(tk.END, "-" * len(nombre_prueba) + "\n")
+        """Agregar el resultado de una prueba al texto de resumen
+
+        El texto se acumula en self.buffer_resultados y se muestra en
+        finalizar_pruebas.
+        """
+        lineas = ["", nombre_prueba, "-" * len(nombre_prueba)]
 
         if 'estadistico' in resultado:
-            self.text_resultados.insert(
-                tk.END, f"Estadístico: {resultado['estadistico']:.6f}\n")
+            lineas.append(f"Estadístico: {resultado['estadistico']:.6f}")
         if 'valor_critico' in resultado:
-            self.text_resultados.insert(
-                tk.END, f"Valor crítico: {resultado['valor_critico']:.6f}\n")
+            lineas.append(f"Valor crítico: {resultado['valor_critico']:.6f}")
         if 'p_valor' in resultado:
-            self.text_resultados.insert(
-                tk.END, f"P-valor: {resultado['p_valor']:.6f}\n")
+            lineas.append(f"P-valor: {resultado['p_valor']:.6f}")
 
         # Resultado de la prueba
         if resultado['rechaza_h0']:
-            self.text_resultados.insert(
-                tk.END, "RESULTADO: Se RECHAZA H0 - Los datos NO siguen la distribución esperada\n")
+            lineas.append(
+                "RESULTADO: Se RECHAZA H0 - Los datos NO siguen la distribución esperada")
         else:
-            self.text_resultados.insert(
-                tk.END, "RESULTADO: NO se rechaza H0 - Los datos siguen la distribución esperada\n")
+            lineas.append(
+                "RESULTADO: NO se rechaza H0 - Los datos siguen la distribución esperada")
 
-        self.text_resultados.insert(tk.END, "\n")
-        self.text_resultados.see(tk.END)
-        self.root.update()
+        self.buffer_resultados.append("\n".join(lineas) + "\n\n")
 
     def mostrar_detalle_chi(self):
         """Muestra la ventana de detalle para la prueba Chi-cuadrado."""
@@ -589,90 +804,27 @@ class InterfazPrincipal:
             return
 
         try:
-            # Crear documento PDF
-            doc = SimpleDocTemplate(archivo_pdf, pagesize=letter)
-            story = []
-            styles = getSampleStyleSheet()
-
-            # Título
-            titulo = Paragraph(
-                "Reporte de Pruebas Estadísticas", styles['Title'])
-            story.append(titulo)
-            story.append(Spacer(1, 20))
-
-            # Información de los datos
-            info_datos = f"""
-            <b>Información de los datos:</b><br/>
-            Cantidad de datos: {len(self.datos)}<br/>
-            Media: {np.mean(self.datos):.6f}<br/>
-            Desviación estándar: {np.std(self.datos):.6f}<br/>
-            Mínimo: {np.min(self.datos):.6f}<br/>
-            Máximo: {np.max(self.datos):.6f}<br/>
-            Nivel de significancia: {self.var_alpha.get()}
-            """
-
-            story.append(Paragraph(info_datos, styles['Normal']))
-            story.append(Spacer(1, 20))
-
-            # Resultados de cada prueba
-            # Use self.resultados which stores the summary for PDF generation
-            for nombre_clave_prueba, resultado_summary in self.resultados.items():
-                # Get the display name for the PDF
-                display_name_map = {
-                    'chi_cuadrado': "Chi Cuadrado",
-                    'kolmogorov_smornov': "Kolmogorov-Smirnov",
-                    'rachas_ascendentes_decendentes': "Rachas Ascendentes/Descendentes",
-                    'rachas_encima_debajo': "Rachas Encima/Debajo",
-                    'longitud_rachas_asc': "Longitud Rachas Ascendentes/Descendentes",
-                    'longitud_rachas_enc': "Longitud Rachas Encima/Debajo",
-                }
-                titulo_prueba = display_name_map.get(
-                    nombre_clave_prueba, nombre_clave_prueba.replace('_', ' ').title())
-                story.append(Paragraph(titulo_prueba, styles['Heading2']))
-
-                # Crear tabla con resultados
-                datos_tabla = []
-                datos_tabla.append(['Parámetro', 'Valor'])
-
-                if 'estadistico' in resultado_summary:
-                    datos_tabla.append(
-                        ['Estadístico', f"{resultado_summary['estadistico']:.6f}"])
-                if 'valor_critico' in resultado_summary:
-                    datos_tabla.append(
-                        ['Valor crítico', f"{resultado_summary['valor_critico']:.6f}"])
-                if 'p_valor' in resultado_summary:
-                    datos_tabla.append(
-                        ['P-valor', f"{resultado_summary['p_valor']:.6f}"])
-
-                # Resultado de la prueba
-                if resultado_summary['rechaza_h0']:
-                    decision = "Se rechaza H0"
-                    interpretacion = "Los datos NO siguen la distribución esperada"
-                else:
-                    decision = "No se rechaza H0"
-                    interpretacion = "Los datos siguen la distribución esperada"
-
-                datos_tabla.append(['Decisión', decision])
-                datos_tabla.append(['Interpretación', interpretacion])
-
-                # Crear y estilizar tabla
-                tabla = Table(datos_tabla)
-                tabla.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-
-                story.append(tabla)
-                story.append(Spacer(1, 20))
-
-            # Generar PDF
-            doc.build(story)
+            # La caché se vacía al cargar otro archivo y al volver a ejecutar las
+            # pruebas; dentro de una ejecución el PDF depende de los parámetros
+            # que muestra el encabezado y de las pruebas ejecutadas
+            clave_cache = (self.var_alpha.get(), self.var_intervalos.get(),
+                           tuple(self.resultados))
+            contenido_pdf = self.cache_pdf.get(clave_cache)
+            if contenido_pdf is None:
+                contenido_pdf = self.construir_pdf()
+                self.cache_pdf[clave_cache] = contenido_pdf
+
+            # Una sola escritura a un archivo temporal y os.replace: el destino
+            # nunca queda a medio escribir (útil en unidades de red/OneDrive)
+            archivo_temporal = archivo_pdf + ".tmp"
+            try:
+                with open(archivo_temporal, 'wb') as f:
+                    f.write(contenido_pdf)
+                os.replace(archivo_temporal, archivo_pdf)
+            except OSError:
+                if os.path.exists(archivo_temporal):
+                    os.remove(archivo_temporal)
+                raise
 
             messagebox.showinfo(
                 "Éxito", f"Reporte PDF generado: {archivo_pdf}")
@@ -680,6 +832,89 @@ class InterfazPrincipal:
         except Exception as e:
             messagebox.showerror("Error", f"Error al generar el PDF: {str(e)}")
 
+    def construir_pdf(self):
+        """Construir el reporte PDF en memoria y devolver sus bytes"""
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import (Paragraph, SimpleDocTemplate, Spacer,
+                                        Table, TableStyle)
+
+        # Crear documento PDF
+        buffer_pdf = io.BytesIO()
+        doc = SimpleDocTemplate(buffer_pdf, pagesize=letter)
+        story = []
+        styles = getSampleStyleSheet()
+
+        # Título
+        titulo = Paragraph(
+            "Reporte de Pruebas Estadísticas", styles['Title'])
+        story.append(titulo)
+        story.append(Spacer(1, 20))
+
+        # Información de los datos
+        est = self.estadisticas_datos
+        info_datos = f"""
+        <b>Información de los datos:</b><br/>
+        Cantidad de datos: {est['n']}<br/>
+        Media: {est['media']:.6f}<br/>
+        Desviación estándar: {est['desviacion']:.6f}<br/>
+        Mínimo: {est['minimo']:.6f}<br/>
+        Máximo: {est['maximo']:.6f}<br/>
+        Nivel de significancia: {self.var_alpha.get()}
+        """
+
+        story.append(Paragraph(info_datos, styles['Normal']))
+        story.append(Spacer(1, 20))
+
+        # Un único estilo compartido por todas las tablas
+        estilo_tabla = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+
+        # Resultados de cada prueba
+        # Use self.resultados which stores the summary for PDF generation
+        for nombre_clave_prueba, resultado_summary in self.resultados.items():
+            # Get the display name for the PDF
+            titulo_prueba = NOMBRES_PRUEBAS_PDF.get(
+                nombre_clave_prueba, nombre_clave_prueba.replace('_', ' ').title())
+            story.append(Paragraph(titulo_prueba, styles['Heading2']))
+
+            # Crear tabla con resultados
+            datos_tabla = [['Parámetro', 'Valor']]
+            datos_tabla.extend([etiqueta, f"{resultado_summary[clave]:.6f}"]
+                               for clave, etiqueta in CAMPOS_TABLA_PDF
+                               if clave in resultado_summary)
+
+            # Resultado de la prueba
+            if resultado_summary['rechaza_h0']:
+                decision = "Se rechaza H0"
+                interpretacion = "Los datos NO siguen la distribución esperada"
+            else:
+                decision = "No se rechaza H0"
+                interpretacion = "Los datos siguen la distribución esperada"
+
+            datos_tabla.append(['Decisión', decision])
+            datos_tabla.append(['Interpretación', interpretacion])
+
+            # Crear y estilizar tabla
+            tabla = Table(datos_tabla)
+            tabla.setStyle(estilo_tabla)
+
+            story.append(tabla)
+            story.append(Spacer(1, 20))
+
+        # Generar PDF
+        doc.build(story)
+        return buffer_pdf.getvalue()
+
 
 def main():
     root = tk.Tk()
@@ -15,47 +15,39 @@ class RachasAscendentesDescendentes:
         self.resultados = {}
 
     def ejecutar(self):
-        # Paso 1: Identificar cambios de dirección
-        direcciones = []
-        for i in range(1, self.N):
-            if self.datos[i] > self.datos[i-1]:
-                direcciones.append(1)  # Ascendente
-            elif self.datos[i] < self.datos[i-1]:
-                direcciones.append(-1)  # Descendente
-            else:
-                # En caso de empate, mantener la dirección anterior
-                if direcciones:
-                    direcciones.append(direcciones[-1])
-                else:
-                    direcciones.append(1)  # Por defecto ascendente
+        datos = np.asarray(self.datos, dtype=np.float64)
+
+        # Paso 1: Identificar cambios de dirección (1 ascendente, -1 descendente)
+        direcciones = np.sign(np.diff(datos)).astype(np.int8)
+        if direcciones.size:
+            # En caso de empate, mantener la dirección anterior
+            # (por defecto ascendente si el empate está al inicio)
+            if direcciones[0] == 0:
+                direcciones[0] = 1
+            ultimo = np.where(direcciones != 0, np.arange(direcciones.size), 0)
+            np.maximum.accumulate(ultimo, out=ultimo)
+            direcciones = direcciones[ultimo]
 
         # Paso 2: Contar rachas (cambios de dirección)
-        if not direcciones:
+        if direcciones.size == 0:
             # Si solo hay un dato
             rachas = []
             A = 0
-            longitudes = []
+            longitudes = np.empty(0, dtype=np.int64)
         else:
-            rachas = []
-            racha_actual = [direcciones[0]]
-
-            for i in range(1, len(direcciones)):
-                if direcciones[i] == direcciones[i-1]:
-                    racha_actual.append(direcciones[i])
-                else:
-                    rachas.append(racha_actual)
-                    racha_actual = [direcciones[i]]
-
-            rachas.append(racha_actual)
+            cambios = np.flatnonzero(direcciones[1:] != direcciones[:-1]) + 1
+            limites = np.concatenate(([0], cambios, [direcciones.size]))
+            longitudes = np.diff(limites)
 
             # Número de rachas (A) es la cantidad de grupos
-            A = len(rachas)
-            longitudes = [len(r) for r in rachas]
+            A = int(longitudes.size)
+            rachas = [[int(d)] * int(lon) for d, lon in
+                      zip(direcciones[limites[:-1]], longitudes)]
 
         # Contar frecuencias de longitudes
-        frecuencias = {}
-        for lon in longitudes:
-            frecuencias[lon] = frecuencias.get(lon, 0) + 1
+        conteo = np.bincount(longitudes)
+        frecuencias = {int(lon): int(conteo[lon])
+                       for lon in np.flatnonzero(conteo)}
 
         # Paso 3: Cálculos estadísticos
         mu_A = (2 * self.N - 1) / 3
@@ -70,8 +62,8 @@ class RachasAscendentesDescendentes:
         # Almacenar resultados
         self.resultados = {
             'numero_rachas': A,  # ESTE ES EL ESTADÍSTICO A IMPORTANTE
-            'suma_longitudes': sum(longitudes) if longitudes else 0,
-            'longitud_maxima': max(longitudes) if longitudes else 0,
+            'suma_longitudes': int(longitudes.sum()),
+            'longitud_maxima': int(longitudes.max()) if longitudes.size else 0,
             'frecuencias_longitudes': frecuencias,
             'rachas': rachas,
             'mu_A': mu_A,
@@ -140,8 +132,13 @@ class RachasAscendentesDescendentes:
         tree.column('Longitud', width=75, anchor=tk.CENTER)
         tree.column('Frecuencia', width=50, anchor=tk.CENTER)
 
+        # frecuencias_longitudes ya viene ordenado por longitud: las dos
+        # listas se arman una vez y sirven para la tabla y el gráfico
+        longitudes = list(self.resultados['frecuencias_longitudes'].keys())
+        frecuencias = list(self.resultados['frecuencias_longitudes'].values())
+
         # Insertar datos
-        for longitud, freq in self.resultados['frecuencias_longitudes'].items():
+        for longitud, freq in zip(longitudes, frecuencias):
             tree.insert('', tk.END, values=(longitud, freq))
 
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -150,14 +147,6 @@ class RachasAscendentesDescendentes:
         # Gráfico de distribución de longitudes
         try:
             fig, ax = plt.subplots(figsize=(10, 6))
-            longitudes = list(self.resultados['frecuencias_longitudes'].keys())
-            frecuencias = list(
-                self.resultados['frecuencias_longitudes'].values())
-
-            # Ordenar por longitud para mejor visualización
-            longitudes.sort()
-            frecuencias = [self.resultados['frecuencias_longitudes'][lon]
-                           for lon in longitudes]
 
             sns.barplot(x=longitudes, y=frecuencias, ax=ax,
                         palette="viridis", hue=longitudes, legend=False)
@@ -1,10 +1,44 @@
-import pandas as pd
-from collections import defaultdict
+import numpy as np
 import math
-from scipy.stats import norm
 import tkinter as tk
 from tkinter import ttk
 
+# Z teórico bilateral para los niveles de significancia más usados
+_Z_TABLE = {0.01: 2.5758293035489004, 0.05: 1.959963984540054, 0.10: 1.6448536269514722}
+
+# Coeficientes de la aproximación racional de Acklam para la inversa de la normal
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+      3.754408661907416e+00)
+
+
+def _inv_norm(p):
+    """Inversa de la función de distribución normal estándar (0 < p < 1)"""
+    p_bajo = 0.02425
+    if p < p_bajo:
+        q = math.sqrt(-2 * math.log(p))
+        x = (((((_C[0]*q + _C[1])*q + _C[2])*q + _C[3])*q + _C[4])*q + _C[5]) / \
+            ((((_D[0]*q + _D[1])*q + _D[2])*q + _D[3])*q + 1)
+    elif p <= 1 - p_bajo:
+        q = p - 0.5
+        r = q * q
+        x = (((((_A[0]*r + _A[1])*r + _A[2])*r + _A[3])*r + _A[4])*r + _A[5])*q / \
+            (((((_B[0]*r + _B[1])*r + _B[2])*r + _B[3])*r + _B[4])*r + 1)
+    else:
+        q = math.sqrt(-2 * math.log(1 - p))
+        x = -(((((_C[0]*q + _C[1])*q + _C[2])*q + _C[3])*q + _C[4])*q + _C[5]) / \
+            ((((_D[0]*q + _D[1])*q + _D[2])*q + _D[3])*q + 1)
+    
+    # Un paso de Halley con erfc lleva el error a precisión de máquina
+    e = 0.5 * math.erfc(-x / math.sqrt(2)) - p
+    u = e * math.sqrt(2 * math.pi) * math.exp(x * x / 2)
+    return x - u / (1 + x * u / 2)
+
 class RachasEncimaDebajo:
     def __init__(self, datos, alpha=0.05):
         """
@@ -14,18 +48,20 @@ class RachasEncimaDebajo:
             datos: array de números aleatorios
             alpha: nivel de significancia
         """
-        self.datos = datos
+        self.datos = np.ascontiguousarray(datos, dtype=np.float64)
         self.alpha = alpha
-        self.numeros = datos.tolist() if hasattr(datos, 'tolist') else list(datos)
         
         # Variables para almacenar resultados
-        self.simbolos = []
+        self.mascara = np.zeros(0, dtype=bool)  # True = '+', False = '-'
         self.n1 = 0  # total de símbolos positivos
         self.n2 = 0  # total de símbolos negativos
-        self.grupos = []
+        self.longitudes_grupos = np.zeros(0, dtype=np.int64)  # longitud de cada grupo
+        self.simbolos_grupos = np.zeros(0, dtype=bool)  # símbolo de cada grupo
         self.B = 0  # total de grupos
-        self.conteo_longitudes = defaultdict(int)
-        self.tabla = None
+        self.conteo_longitudes = {}  # {longitud: cantidad de grupos}
+        self.frecuencias_longitudes = np.zeros(0, dtype=np.int64)  # índice = longitud
+        self.tabla_longitudes = np.zeros(0, dtype=np.int64)  # longitudes presentes, ordenadas
+        self.tabla_totales = np.zeros(0, dtype=np.int64)  # grupos de cada longitud
         
         # Estadísticos de la prueba
         self.mu_B = 0
@@ -37,31 +73,56 @@ class RachasEncimaDebajo:
         
     def ejecutar(self):
         """
-        Ejecuta la prueba de rachas completa
+        Ejecuta la prueba de rachas completa en una sola pasada vectorizada
         
         Returns:
             dict: Diccionario con los resultados de la prueba
         """
         try:
-            # Paso 1: Convertir números a símbolos (+ o -)
-            self._convertir_a_simbolos()
+            # Símbolos como máscara booleana (True = '+', False = '-')
+            mascara = self.datos >= 0.5
             
-            # Paso 2: Contar cantidad de símbolos individuales
-            self._contar_simbolos()
+            # Cantidad de símbolos individuales
+            n1 = int(np.count_nonzero(mascara))
+            n2 = mascara.size - n1
             
-            # Paso 3: Agrupar símbolos consecutivos iguales
-            self._agrupar_simbolos()
+            # Con un solo tipo de símbolo la prueba no está definida: se corta
+            # antes de armar grupos y tablas
+            if n1 == 0 or n2 == 0:
+                return {
+                    'error': True,
+                    'mensaje': "Error en la prueba de rachas: todos los datos quedan del mismo lado de 0.5",
+                    'tipo_prueba': 'Prueba de Rachas',
+                    'alpha': self.alpha
+                }
             
-            # Paso 4: Contar grupos por longitud
-            self._contar_longitudes()
+            # Grupos: uno nuevo empieza donde el símbolo cambia respecto al anterior
+            # (los límites se escriben en un único arreglo, sin temporales intermedios)
+            cambios = np.flatnonzero(mascara[1:] != mascara[:-1])
+            B = cambios.size + 1  # B = 1 + cantidad de cambios de símbolo
+            limites = np.empty(B + 1, dtype=np.int64)
+            limites[0] = 0
+            limites[-1] = mascara.size
+            np.add(cambios, 1, out=limites[1:-1])
+            longitudes = np.diff(limites)
             
-            # Paso 5: Crear tabla
-            self._crear_tabla()
+            # Grupos por longitud (bincount ya las deja ordenadas)
+            frecuencias = np.bincount(longitudes)
+            longitudes_tabla = np.flatnonzero(frecuencias)
             
-            # Paso 6: Calcular estadísticos
-            self._calcular_estadisticos()
+            # Se guardan en self solo para la ventana de detalle
+            self.mascara = mascara
+            self.n1 = n1
+            self.n2 = n2
+            self.longitudes_grupos = longitudes
+            self.simbolos_grupos = mascara[limites[:-1]]
+            self.B = B
+            self.frecuencias_longitudes = frecuencias
+            self.tabla_longitudes = longitudes_tabla
+            self.tabla_totales = frecuencias[longitudes_tabla]
+            self.conteo_longitudes = dict(zip(longitudes_tabla.tolist(), self.tabla_totales.tolist()))
             
-            # Paso 7: Evaluar hipótesis
+            self._calcular_estadisticos()
             return self._evaluar_hipotesis()
             
         except Exception as e:
@@ -72,51 +133,6 @@ class RachasEncimaDebajo:
                 'alpha': self.alpha
             }
     
-    def _convertir_a_simbolos(self):
-        """Convierte números a símbolos (+ o -)"""
-        self.simbolos = ['+' if x >= 0.5 else '-' for x in self.numeros]
-    
-    def _contar_simbolos(self):
-        """Cuenta la cantidad de símbolos individuales"""
-        self.n1 = self.simbolos.count('+')  # total de símbolos positivos
-        self.n2 = self.simbolos.count('-')  # total de símbolos negativos
-    
-    def _agrupar_simbolos(self):
-        """Agrupa símbolos consecutivos iguales"""
-        if not self.simbolos:
-            return
-            
-        self.grupos = []
-        longitud = 1
-        simbolo_actual = self.simbolos[0]
-        self.B = 0
-        
-        for i in range(1, len(self.simbolos)):
-            if self.simbolos[i] == simbolo_actual:
-                longitud += 1
-            else:
-                self.grupos.append((simbolo_actual, longitud))
-                self.B += 1
-                simbolo_actual = self.simbolos[i]
-                longitud = 1
-        
-        # Agregar el último grupo
-        self.grupos.append((simbolo_actual, longitud))
-        self.B += 1
-    
-    def _contar_longitudes(self):
-        """Cuenta grupos por longitud"""
-        self.conteo_longitudes = defaultdict(int)
-        for _, longitud in self.grupos:
-            self.conteo_longitudes[longitud] += 1
-    
-    def _crear_tabla(self):
-        """Crea tabla con los resultados"""
-        self.tabla = pd.DataFrame({
-            'LONGITUD': sorted(self.conteo_longitudes.keys()),
-            'TOTAL': [self.conteo_longitudes[k] for k in sorted(self.conteo_longitudes.keys())]
-        })
-    
     def _calcular_estadisticos(self):
         """Calcula los estadísticos de la prueba"""
         # Cálculo de μB
@@ -135,10 +151,10 @@ class RachasEncimaDebajo:
             self.z_prueba = 0
         
         # Z teórico para prueba bilateral
-        self.z_teorico = norm.ppf(1 - self.alpha / 2)
+        self.z_teorico = _Z_TABLE.get(self.alpha) or _inv_norm(1 - self.alpha / 2)
         
-        # Cálculo del p-valor
-        self.p_valor = 2 * (1 - norm.cdf(abs(self.z_prueba)))
+        # Cálculo del p-valor: 2 * (1 - Φ(|z|)) = erfc(|z| / √2)
+        self.p_valor = math.erfc(abs(self.z_prueba) / math.sqrt(2))
     
     def _evaluar_hipotesis(self):
         """Evalúa la hipótesis y retorna los resultados"""
@@ -156,7 +172,7 @@ class RachasEncimaDebajo:
             'sigma_B': self.sigma_B,
             'n1': self.n1,
             'n2': self.n2,
-            'total_datos': len(self.numeros)
+            'total_datos': self.datos.size
         }
     
     def obtener_tabla_detallada(self):
@@ -166,7 +182,12 @@ class RachasEncimaDebajo:
         Returns:
             pd.DataFrame: Tabla con longitudes y totales
         """
-        return self.tabla
+        # pandas solo se importa si alguien pide la tabla como DataFrame
+        import pandas as pd
+        return pd.DataFrame({
+            'LONGITUD': self.tabla_longitudes,
+            'TOTAL': self.tabla_totales
+        })
     
     def obtener_grupos_detallados(self):
         """
@@ -175,7 +196,9 @@ class RachasEncimaDebajo:
         Returns:
             list: Lista de tuplas (símbolo, longitud)
         """
-        return self.grupos
+        # Los símbolos se guardan como bool; se pasan a '+'/'-' solo al pedirlos
+        return list(zip(np.where(self.simbolos_grupos, '+', '-').tolist(),
+                        self.longitudes_grupos.tolist()))
     
     def obtener_simbolos(self):
         """
@@ -184,7 +207,7 @@ class RachasEncimaDebajo:
         Returns:
             list: Lista de símbolos (+ o -)
         """
-        return self.simbolos
+        return np.where(self.mascara, '+', '-').tolist()
     
     def mostrar_tabla_detallada(self, parent=None):
         """
@@ -210,11 +233,12 @@ class RachasEncimaDebajo:
         scrollbar_estadisticos = ttk.Scrollbar(frame_estadisticos, orient="vertical", command=text_estadisticos.yview)
         text_estadisticos.configure(yscrollcommand=scrollbar_estadisticos.set)
         
-        estadisticos_info = f"""PRUEBA DE RACHAS - ESTADÍSTICOS DETALLADOS
+        def llenar_estadisticos():
+            estadisticos_info = f"""PRUEBA DE RACHAS - ESTADÍSTICOS DETALLADOS
 {'='*50}
 
 DATOS BÁSICOS:
-• Total de datos: {len(self.numeros)}
+• Total de datos: {self.datos.size}
 • Símbolos '+' (≥ 0.5): {self.n1}
 • Símbolos '-' (< 0.5): {self.n2}
 • Total de grupos (B): {self.B}
@@ -238,8 +262,8 @@ de grupos consecutivos de símbolos iguales. Un número muy alto o muy bajo
 de grupos puede indicar falta de aleatoriedad.
 """
         
-        text_estadisticos.insert(tk.END, estadisticos_info)
-        text_estadisticos.config(state=tk.DISABLED)
+            text_estadisticos.insert(tk.END, estadisticos_info)
+            text_estadisticos.config(state=tk.DISABLED)
         
         text_estadisticos.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar_estadisticos.pack(side=tk.RIGHT, fill=tk.Y)
@@ -255,10 +279,13 @@ de grupos puede indicar falta de aleatoriedad.
         tree_tabla.column('Longitud', width=150, anchor='center')
         tree_tabla.column('Total', width=150, anchor='center')
         
-        # Llenar la tabla
-        if self.tabla is not None:
-            for _, row in self.tabla.iterrows():
-                tree_tabla.insert('', tk.END, values=(row['LONGITUD'], row['TOTAL']))
+        def llenar_tabla():
+            # Llenar la tabla
+            # Llamada directa a Tcl por fila, sin el envoltorio de Treeview.insert
+            insertar = tree_tabla.tk.call
+            filas = zip(self.tabla_longitudes.tolist(), self.tabla_totales.tolist())
+            for longitud, total in filas:
+                insertar(tree_tabla._w, 'insert', '', 'end', '-values', (longitud, total))
         
         scrollbar_tabla = ttk.Scrollbar(frame_tabla, orient="vertical", command=tree_tabla.yview)
         tree_tabla.configure(yscrollcommand=scrollbar_tabla.set)
@@ -274,38 +301,64 @@ de grupos puede indicar falta de aleatoriedad.
         scrollbar_simbolos = ttk.Scrollbar(frame_simbolos, orient="vertical", command=text_simbolos.yview)
         text_simbolos.configure(yscrollcommand=scrollbar_simbolos.set)
         
-        # Mostrar primeros datos y sus símbolos
-        simbolos_info = "CONVERSIÓN DE DATOS A SÍMBOLOS\n"
-        simbolos_info += "="*40 + "\n\n"
-        simbolos_info += "Criterio: '+' si dato ≥ 0.5, '-' si dato < 0.5\n\n"
-        simbolos_info += "Primeros 50 datos:\n"
-        simbolos_info += f"{'Índice':<6} {'Dato':<10} {'Símbolo':<8}\n"
-        simbolos_info += "-" * 25 + "\n"
+        def llenar_simbolos():
+            # Mostrar primeros datos y sus símbolos
+            lineas = [
+                "CONVERSIÓN DE DATOS A SÍMBOLOS",
+                "=" * 40,
+                "",
+                "Criterio: '+' si dato ≥ 0.5, '-' si dato < 0.5",
+                "",
+                "Primeros 50 datos:",
+                f"{'Índice':<6} {'Dato':<10} {'Símbolo':<8}",
+                "-" * 25,
+            ]
+            lineas.extend(f"{i+1:<6} {float(self.datos[i]):<10.4f} {'+' if self.mascara[i] else '-':<8}"
+                          for i in range(min(50, self.datos.size)))
         
-        for i in range(min(50, len(self.numeros))):
-            simbolos_info += f"{i+1:<6} {self.numeros[i]:<10.4f} {self.simbolos[i]:<8}\n"
+            if self.datos.size > 50:
+                lineas.extend(["", f"... y {self.datos.size - 50} datos más"])
         
-        if len(self.numeros) > 50:
-            simbolos_info += f"\n... y {len(self.numeros) - 50} datos más\n"
+            lineas.extend(["", "SECUENCIA COMPLETA DE SÍMBOLOS:",
+                           np.where(self.mascara, b'+', b'-').tobytes().decode('ascii')])
         
-        simbolos_info += f"\nSECUENCIA COMPLETA DE SÍMBOLOS:\n"
-        simbolos_info += "".join(self.simbolos)
+            lineas.extend(["", "GRUPOS IDENTIFICADOS:",
+                           f"{'Grupo':<6} {'Símbolo':<8} {'Longitud':<8}",
+                           "-" * 25])
         
-        simbolos_info += f"\n\nGRUPOS IDENTIFICADOS:\n"
-        simbolos_info += f"{'Grupo':<6} {'Símbolo':<8} {'Longitud':<8}\n"
-        simbolos_info += "-" * 25 + "\n"
+            # Mostrar primeros 20 grupos
+            lineas.extend(f"{i+1:<6} {'+' if self.simbolos_grupos[i] else '-':<8} {int(self.longitudes_grupos[i]):<8}"
+                          for i in range(min(20, self.B)))
         
-        for i, (simbolo, longitud) in enumerate(self.grupos[:20]):  # Mostrar primeros 20 grupos
-            simbolos_info += f"{i+1:<6} {simbolo:<8} {longitud:<8}\n"
+            if self.B > 20:
+                lineas.extend(["", f"... y {self.B - 20} grupos más"])
         
-        if len(self.grupos) > 20:
-            simbolos_info += f"\n... y {len(self.grupos) - 20} grupos más\n"
+            simbolos_info = "\n".join(lineas) + "\n"
         
-        text_simbolos.insert(tk.END, simbolos_info)
-        text_simbolos.config(state=tk.DISABLED)
+            text_simbolos.insert(tk.END, simbolos_info)
+            text_simbolos.config(state=tk.DISABLED)
         
         text_simbolos.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar_simbolos.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Cada pestaña se llena la primera vez que se muestra
+        pendientes = {
+            str(frame_estadisticos): llenar_estadisticos,
+            str(frame_tabla): llenar_tabla,
+            str(frame_simbolos): llenar_simbolos,
+        }
+        
+        def al_cambiar_pestana(event=None):
+            llenar = pendientes.pop(notebook.select(), None)
+            if llenar is not None:
+                llenar()
+        
+        notebook.bind("<<NotebookTabChanged>>", al_cambiar_pestana)
+        
+        # La ventana se dibuja vacía y la primera pestaña se llena cuando Tk
+        # queda libre, para no bloquear la apertura
+        ventana.update_idletasks()
+        ventana.after_idle(al_cambiar_pestana)
+        
         if parent is None:
             ventana.mainloop()
\ No newline at end of file